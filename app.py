@@ -1,9 +1,19 @@
 # ==============================================================================
 # Imports
 # ==============================================================================
-from flask import Flask, jsonify, render_template
+import gzip
+import hashlib
+import json
+import os
+
+from flask import Flask, render_template, request
+import numpy as np
 import pandas as pd
-from math import radians, sin, cos, sqrt, atan2
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.ipc
+import pyarrow.parquet as pq
 from scipy.spatial import KDTree
 
 # ==============================================================================
@@ -11,6 +21,16 @@ from scipy.spatial import KDTree
 # ==============================================================================
 app = Flask(__name__)
 
+ARROW_STREAM_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+# Decimal places kept for floats in every JSON response.
+JSON_DOUBLE_PRECISION = 10
+
+# Bump whenever a loader changes what it writes to its Parquet cache, so
+# cache files from older code are rebuilt instead of served.
+CACHE_VERSION = 1
+CACHE_KEY_METADATA = b'manta_cache_key'
+
 # ==============================================================================
 # Data Processing and Analysis Functions
 # ==============================================================================
@@ -19,60 +39,232 @@ app = Flask(__name__)
 def haversine_distance(lat1, lon1, lat2, lon2):
     """Calculates the distance between two points on Earth in nautical miles.
 
+    Built from NumPy ufuncs, so any argument may also be an array; passing
+    whole columns computes every distance in a single vectorized call.
+    The result has the precision of the inputs (float64 for coordinates).
+
     Args:
-        lat1 (float): Latitude of the first point.
-        lon1 (float): Longitude of the first point.
-        lat2 (float): Latitude of the second point.
-        lon2 (float): Longitude of the second point.
+        lat1 (float or np.ndarray): Latitude of the first point.
+        lon1 (float or np.ndarray): Longitude of the first point.
+        lat2 (float or np.ndarray): Latitude of the second point.
+        lon2 (float or np.ndarray): Longitude of the second point.
 
     Returns:
-        float: The distance in nautical miles.
+        float or np.ndarray: The distance in nautical miles.
     """
     R = 3440  # Radius of Earth in nautical miles
 
     # Convert latitude and longitude from degrees to radians.
-    dLat = radians(lat2 - lat1)
-    dLon = radians(lon2 - lon1)
+    dLat = np.radians(lat2 - lat1)
+    dLon = np.radians(lon2 - lon1)
 
     # Haversine formula
-    a = sin(dLat / 2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dLon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    a = np.sin(dLat / 2)**2 + np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(dLon / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
     distance = R * c
 
     return distance
 
+def to_unit_vectors(lats, lons):
+    """Converts latitude/longitude pairs to 3D points on the unit sphere.
+
+    Straight-line (chord) distance between two such points increases
+    monotonically with their great-circle distance, so a Euclidean
+    nearest-neighbour search over them is a correct great-circle search.
+
+    Args:
+        lats (np.ndarray): Latitudes in degrees.
+        lons (np.ndarray): Longitudes in degrees.
+
+    Returns:
+        np.ndarray: An (n, 3) array of x, y, z coordinates.
+    """
+    lat = np.radians(lats)
+    lon = np.radians(lons)
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+def build_port_tree(ports_df):
+    """Builds the spatial index used for nearest-port lookups.
+
+    Args:
+        ports_df (pd.DataFrame): Port data with LATITUDE and LONGITUDE columns.
+
+    Returns:
+        KDTree: A KD-Tree over the ports' unit-sphere coordinates, or None
+                if there is no port data.
+    """
+    if ports_df.empty:
+        return None
+    return KDTree(to_unit_vectors(ports_df['LATITUDE'].to_numpy(), ports_df['LONGITUDE'].to_numpy()))
+
+def nearest_port_distances(port_tree, vessel_lats, vessel_lons, port_lats, port_lons):
+    """Calculates the great-circle distance from each vessel to its nearest port.
+
+    Ports are indexed in a KD-Tree over unit-sphere coordinates, so each
+    vessel position costs an O(log P) query instead of a scan of every port.
+    Memory use stays O(V + P): no vessel-by-port distance matrix is built.
+
+    Args:
+        port_tree (KDTree): Port index built by build_port_tree().
+        vessel_lats (np.ndarray): Vessel latitudes in degrees.
+        vessel_lons (np.ndarray): Vessel longitudes in degrees.
+        port_lats (np.ndarray): Port latitudes in degrees, in tree order.
+        port_lons (np.ndarray): Port longitudes in degrees, in tree order.
+
+    Returns:
+        np.ndarray: The distance to the nearest port in nautical miles.
+    """
+    # workers=-1 spreads the independent queries across all CPU cores.
+    _, nearest = port_tree.query(to_unit_vectors(vessel_lats, vessel_lons), k=1, workers=-1)
+
+    # Only the matched vessel/port pairs need an exact haversine distance.
+    return haversine_distance(vessel_lats, vessel_lons, port_lats[nearest], port_lons[nearest])
+
 # --- Data Loading Functions --
+def make_cache_key(**settings):
+    """Builds a short fingerprint of the settings a cache file was produced with.
+
+    Args:
+        **settings: Every value that affects the cached data.
+
+    Returns:
+        str: A hex digest that changes whenever any setting changes.
+    """
+    description = repr(sorted(settings.items()))
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()[:16]
+
+def read_cache(cache_path, source_path, cache_key):
+    """Reads a Parquet cache file if it can be used in place of its source file.
+
+    Args:
+        cache_path (str): Path to the cached Parquet file.
+        source_path (str): Path to the CSV file the cache was built from.
+        cache_key (str): The key from make_cache_key() for the current settings.
+
+    Returns:
+        pd.DataFrame: The cached data, or None if the cache is missing, older
+                      than the source, built with other settings, or unreadable.
+    """
+    if not (os.path.exists(cache_path) and os.path.exists(source_path)):
+        return None
+    if os.path.getmtime(cache_path) < os.path.getmtime(source_path):
+        return None
+
+    try:
+        table = pq.read_table(cache_path)
+    except (OSError, pa.ArrowException) as e:
+        print(f"⚠️ Could not read cache file {cache_path}, rebuilding it: {e}")
+        return None
+
+    metadata = table.schema.metadata or {}
+    if metadata.get(CACHE_KEY_METADATA) != cache_key.encode('utf-8'):
+        return None
+    return table.to_pandas()
+
+def write_cache(df, cache_path, cache_key):
+    """Writes a prepared DataFrame to a Parquet cache file.
+
+    The file is written under a temporary name and then moved into place,
+    so an interrupted write or a concurrent worker never leaves a truncated
+    file at cache_path.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to cache.
+        cache_path (str): Path of the Parquet file to write.
+        cache_key (str): The key from make_cache_key() to stamp the file with.
+    """
+    table = pa.Table.from_pandas(df)
+    metadata = {**(table.schema.metadata or {}), CACHE_KEY_METADATA: cache_key.encode('utf-8')}
+    table = table.replace_schema_metadata(metadata)
+
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        pq.write_table(table, temp_path, compression='zstd')
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ Could not write cache file {cache_path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def parse_ais_timestamps(column):
+    """Parses the BaseDateTime column into nanosecond timestamps.
+
+    The AIS format is parsed in Arrow first. If most values do not match
+    it, the column is parsed again with pandas' format inference instead.
+    Values that still cannot be parsed become null.
+
+    Args:
+        column (pa.ChunkedArray): The BaseDateTime column as strings.
+
+    Returns:
+        tuple: The timestamp column (pa.ChunkedArray or pa.Array) and the
+               number of non-null values that could not be parsed.
+    """
+    present_count = len(column) - column.null_count
+    timestamps = pc.strptime(column, format='%Y-%m-%dT%H:%M:%S', unit='ns', error_is_null=True)
+    failed_count = timestamps.null_count - column.null_count
+
+    if failed_count > present_count / 2:
+        print(f"⚠️ {failed_count} of {present_count} timestamps are not in the AIS format. Inferring the format instead.")
+        parsed = pd.to_datetime(column.to_pandas(), errors='coerce')
+        timestamps = pa.array(parsed, type=pa.timestamp('ns'), from_pandas=True)
+        failed_count = timestamps.null_count - column.null_count
+
+    return timestamps, failed_count
+
 def load_port_data():
     """Loads and prepares the world port location data.
 
     This function reads port data from a CSV file, selects only the
     necessary columns, and cleans the data for use in distance calculations.
+    The cleaned result is cached as Parquet and reused on later startups.
 
     Returns:
         pd.DataFrame: A DataFrame containing port names, latitudes, and
                       longitudes, or an empty DataFrame if the file is not found.
     """
     port_file_path = 'ports.csv'
+    port_cache_path = 'ports_cache.parquet'
     required_cols = ['Main Port Name', 'Latitude', 'Longitude']
+    column_types = {'Main Port Name': pa.string(), 'Latitude': pa.float64(), 'Longitude': pa.float64()}
+
+    cache_key = make_cache_key(version=CACHE_VERSION, column_types=column_types)
+    df_clean = read_cache(port_cache_path, port_file_path, cache_key)
+    if df_clean is not None:
+        print("✅ Port data loaded from cache.")
+        return df_clean
+
     try:
-        df = pd.read_csv(port_file_path, usecols=required_cols)
+        table = pv.read_csv(
+            port_file_path,
+            convert_options=pv.ConvertOptions(
+                include_columns=required_cols,
+                column_types=column_types,
+                strings_can_be_null=True
+            )
+        )
     except FileNotFoundError:
         print(f"ERROR: file {port_file_path} was not found.")
         return pd.DataFrame()
-    except ValueError as e:
+    except (KeyError, ValueError) as e:
         print(f"ERROR: Could not find required columns in {port_file_path}. Please check the column names.")
         print(f"Details: {e}")
         return pd.DataFrame()
-    
+
+    # Drop incomplete rows in Arrow so they never reach pandas, and let the
+    # conversion free each Arrow column as soon as pandas owns its copy.
+    df_clean = table.drop_null().to_pandas(split_blocks=True, self_destruct=True)
+    del table
+
     # Rename columns for consistency and ease of use
-    df.rename(columns={
+    df_clean.rename(columns={
         'Main Port Name': 'PORT_NAME',
         'Latitude': 'LATITUDE',
         'Longitude': 'LONGITUDE'
     }, inplace=True)
 
-
-    df_clean = df.dropna()
+    write_cache(df_clean, port_cache_path, cache_key)
     print("✅ Port data loaded and ready.")
     return df_clean
 
@@ -81,60 +273,136 @@ def load_vessel_data():
 
     This function reads a large AIS data file, selects only the required
     columns, drops any rows with missing data, and returns a smaller,
-    manageable sample for the application to use.
+    manageable sample for the application to use. The sample is cached as
+    Parquet so later startups can skip parsing the CSV file entirely.
 
     Returns:
         pd.DataFrame: A cleaned and sampled DataFrame of vessel data,
                       or an empty DataFrame if the source file is not found.
     """
     vessel_data_file_path = 'AIS_2024_01_01 2.csv'
+    vessel_cache_path = 'ais_cache.parquet'
+
+    max_rows = 200000
+    max_vessels = 50
+    movement_threshold = 0.001
+    random_state = 1
 
     required_cols = ['MMSI', 'BaseDateTime', 'LAT', 'LON', 'SOG', 'COG']
+    column_types = {
+        'MMSI': pa.int32(),
+        'BaseDateTime': pa.string(),
+        # Coordinates stay float64: at |value| >= 128 float32 cannot hold
+        # the five decimals AIS reports. Speed and course fit in float32.
+        'LAT': pa.float64(),
+        'LON': pa.float64(),
+        'SOG': pa.float32(),
+        'COG': pa.float32()
+    }
+
+    cache_key = make_cache_key(
+        version=CACHE_VERSION,
+        max_rows=max_rows,
+        max_vessels=max_vessels,
+        movement_threshold=movement_threshold,
+        random_state=random_state,
+        column_types=column_types
+    )
+    df_final_sample = read_cache(vessel_cache_path, vessel_data_file_path, cache_key)
+    if df_final_sample is not None:
+        print("✅ Vessel data loaded from cache.")
+        return df_final_sample
+
+    # Values are converted as each block is read, so conversion errors can
+    # surface when the reader is opened or at any later block.
+    batches = []
+    row_count = 0
     try:
-        df = pd.read_csv(vessel_data_file_path, usecols=required_cols, nrows=200000)
+        # Stream the file block by block and stop once enough rows have been
+        # read, so the rest of the file is never parsed. The pyarrow engine of
+        # pd.read_csv does not support nrows.
+        reader = pv.open_csv(
+            vessel_data_file_path,
+            convert_options=pv.ConvertOptions(include_columns=required_cols, column_types=column_types)
+        )
+        for batch in reader:
+            batches.append(batch)
+            row_count += batch.num_rows
+            if row_count >= max_rows:
+                break
     except FileNotFoundError:
         print(f"ERROR: file {vessel_data_file_path} was not found.")
         return pd.DataFrame()
-    
-    df_clean = df.dropna()
-    print(f"   - Initial data loaded with {len(df_clean)} rows.")
+    except pa.ArrowInvalid as e:
+        print(f"ERROR: Could not parse {vessel_data_file_path}. Please check the column values.")
+        print(f"Details: {e}")
+        return pd.DataFrame()
+
+    table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, max_rows)
 
+    # Malformed timestamps become null instead of failing the whole load,
+    # and are then dropped along with the other incomplete rows.
+    present_timestamps = table.num_rows - table['BaseDateTime'].null_count
+    timestamps, failed_timestamps = parse_ais_timestamps(table['BaseDateTime'])
+    if failed_timestamps:
+        print(f"⚠️ {failed_timestamps} timestamps could not be parsed; those rows are dropped.")
+    table = table.set_column(table.column_names.index('BaseDateTime'), 'BaseDateTime', timestamps)
+
+    table_clean = table.drop_null()
+    print(f"   - Initial data loaded with {table_clean.num_rows} rows.")
+
+    # Only the position columns are needed to pick vessels, so the full
+    # table stays in Arrow until it has been filtered down.
     print("   - Identifying moving vessels...")
-    variance = df_clean.groupby('MMSI')[['LAT', 'LON']].std().sum(axis=1)
-    moving_mmsis = variance[variance > 0.001].index.tolist()
+    positions = table_clean.select(['MMSI', 'LAT', 'LON']).to_pandas()
+    variance = positions.groupby('MMSI')[['LAT', 'LON']].std().sum(axis=1)
+    moving_mmsis = variance.index.to_numpy()[variance.to_numpy() > movement_threshold]
 
-    if not moving_mmsis:
-        print("⚠️ No moving vessels found in the data sample. Try increasing nrows.")
+    if len(moving_mmsis) == 0:
+        print("⚠️ No moving vessels found in the data sample. Try increasing max_rows.")
         # Fallback to the old method if no moving vessels are found
-        unique_mmsis = df_clean['MMSI'].unique()
-        sample_size = min(50, len(unique_mmsis))
-        sampled_mmsis = pd.Series(unique_mmsis).sample(n=sample_size, random_state=1).tolist()
+        unique_mmsis = positions['MMSI'].unique()
+        sample_size = min(max_vessels, len(unique_mmsis))
+        sampled_mmsis = pd.Series(unique_mmsis).sample(n=sample_size, random_state=random_state).tolist()
     else:
         # 2. Randomly select from the list of ONLY the moving vessels.
-        sample_size = min(50, len(moving_mmsis))
-        sampled_mmsis = pd.Series(moving_mmsis).sample(n=sample_size, random_state=1).tolist()
-
-    # 3. Filter the original DataFrame to get all rows for the selected MMSIs.
-    df_final_sample = df_clean[df_clean['MMSI'].isin(sampled_mmsis)]
+        sample_size = min(max_vessels, len(moving_mmsis))
+        sampled_mmsis = pd.Series(moving_mmsis).sample(n=sample_size, random_state=random_state).tolist()
+
+    # 3. Filter the Arrow table to the selected MMSIs before converting to pandas,
+    # ordering each vessel's track by time while the data is still in Arrow.
+    sampled_mask = pc.is_in(table_clean['MMSI'], value_set=pa.array(sampled_mmsis, type=pa.int32()))
+    table_sample = table_clean.filter(sampled_mask).sort_by([('MMSI', 'ascending'), ('BaseDateTime', 'ascending')])
+    df_final_sample = table_sample.to_pandas(split_blocks=True, self_destruct=True)
+    del table_sample
+
+    # A sample built from a mostly unreadable file must not be served from
+    # the cache on every later startup.
+    if df_final_sample.empty or failed_timestamps > present_timestamps / 2:
+        print("⚠️ Vessel data looks incomplete, so it is not being cached.")
+    else:
+        write_cache(df_final_sample, vessel_cache_path, cache_key)
 
     print("✅ Vessel data loaded and ready.")
     return df_final_sample  
 
 # --- Analysis Functions ---
-def analyze_vessel_anomalies(vessels_df, ports_df):
+def analyze_vessel_anomalies(vessels_df, ports_df, port_tree):
     """
     Main analysis pipeline. Flags vessels for various anomalous behaviors.
     """
     # --- Loitering Analysis ---
-    if not ports_df.empty:
+    if port_tree is not None:
         DISTANCE_THRESHOLD_NM = 5 # Using sensitive threshold for testing
-        port_coords = ports_df[['LATITUDE', 'LONGITUDE']].values
-        port_tree = KDTree(port_coords)
-        vessel_coords = vessels_df[['LAT', 'LON']].values
-        distances, _ = port_tree.query(vessel_coords, k=1)
-        vessels_df['dist_to_nearest_port'] = distances * 60
-        vessels_df['is_loitering'] = (vessels_df['SOG'] < 1) & (vessels_df['dist_to_nearest_port'] > DISTANCE_THRESHOLD_NM)
-        loitering_count = vessels_df['is_loitering'].sum()
+        distances = nearest_port_distances(
+            port_tree,
+            vessels_df['LAT'].to_numpy(), vessels_df['LON'].to_numpy(),
+            ports_df['LATITUDE'].to_numpy(), ports_df['LONGITUDE'].to_numpy()
+        )
+        is_loitering = (vessels_df['SOG'].to_numpy() < 1) & (distances > DISTANCE_THRESHOLD_NM)
+        vessels_df['dist_to_nearest_port'] = distances
+        vessels_df['is_loitering'] = is_loitering
+        loitering_count = is_loitering.sum()
         print(f"   - Found {loitering_count} potential loitering events.")
     else:
         vessels_df['is_loitering'] = False
@@ -142,12 +410,29 @@ def analyze_vessel_anomalies(vessels_df, ports_df):
     # --- Going Dark Analysis ---
     TIME_THRESHOLD_HOURS = 0.1 # Using sensitive threshold for testing
     TIME_THRESHOLD_SECONDS = TIME_THRESHOLD_HOURS * 3600
-    vessels_df['BaseDateTime'] = pd.to_datetime(vessels_df['BaseDateTime'], errors='coerce')
-    vessels_df.sort_values(by=['MMSI', 'BaseDateTime'], inplace=True)
-    time_gaps = vessels_df.groupby('MMSI')['BaseDateTime'].diff().dt.total_seconds()
-    vessels_df['time_gap_seconds'] = time_gaps.fillna(0)
-    vessels_df['is_dark'] = vessels_df['time_gap_seconds'] > TIME_THRESHOLD_SECONDS
-    dark_count = vessels_df['is_dark'].sum()
+    TIME_THRESHOLD_NS = int(TIME_THRESHOLD_SECONDS * 1_000_000_000)
+
+    # Order rows by vessel, then time, with one lexsort over two integer
+    # arrays instead of a multi-column sort of the whole DataFrame.
+    codes, _ = pd.factorize(vessels_df['MMSI'], sort=True)
+    times_ns = vessels_df['BaseDateTime'].to_numpy().view('i8')
+    order = np.lexsort((times_ns, codes))
+
+    # load_vessel_data() already returns rows in this order, in which case
+    # none of the other columns need to be moved.
+    if not np.array_equal(order, np.arange(len(order))):
+        vessels_df = vessels_df.iloc[order].copy()
+        codes = codes[order]
+        times_ns = times_ns[order]
+
+    # Gaps between consecutive reports, zeroed where a new vessel begins.
+    gaps_ns = np.zeros_like(times_ns)
+    gaps_ns[1:] = times_ns[1:] - times_ns[:-1]
+    gaps_ns[1:][codes[1:] != codes[:-1]] = 0
+    is_dark = gaps_ns > TIME_THRESHOLD_NS
+    vessels_df['time_gap_seconds'] = gaps_ns // 1_000_000_000
+    vessels_df['is_dark'] = is_dark
+    dark_count = is_dark.sum()
     print(f"   - Found {dark_count} potential 'going dark' events.")
 
     # --- Final Anomaly Flag ---
@@ -157,6 +442,139 @@ def analyze_vessel_anomalies(vessels_df, ports_df):
     print("✅ Analysis complete.")
     return vessels_df
 
+def find_latest_anomalies(vessels_df):
+    """Finds the most recent data point for each vessel flagged as anomalous.
+
+    Relies on the rows being ordered by MMSI and then time, as returned by
+    analyze_vessel_anomalies(), so no groupby or sort is needed. When a
+    vessel has several reports at its latest timestamp, the first of them
+    is returned, as groupby(...).idxmax() did.
+
+    Args:
+        vessels_df (pd.DataFrame): The analyzed vessel data.
+
+    Returns:
+        pd.DataFrame: One row per vessel with at least one anomalous point.
+    """
+    if vessels_df.empty:
+        return vessels_df
+
+    # Find all unique MMSIs that have at least one anomalous point.
+    anomalous_mmsis = vessels_df.loc[vessels_df['is_anomalous'], 'MMSI'].unique()
+
+    # Filter DataFrame to get all rows for these anomalous vessels.
+    anomalous_vessels_df = vessels_df[vessels_df['MMSI'].isin(anomalous_mmsis)]
+
+    # Keep the first report at each timestamp, then the most recent
+    # timestamp for each unique anomalous vessel.
+    first_per_timestamp = anomalous_vessels_df.drop_duplicates(['MMSI', 'BaseDateTime'], keep='first')
+    return first_per_timestamp.drop_duplicates('MMSI', keep='last')
+
+# --- Serialization Functions ---
+def widen_float32_columns(df):
+    """Upcasts float32 columns to float64 for output without exposing rounding noise.
+
+    A plain upcast shows float32's binary rounding error (10.8 becomes
+    10.800000190734863). Going through each value's shortest float32 string
+    gives back the source decimals for values with at most about seven
+    significant digits, such as SOG and COG. Wider values are not
+    recoverable from float32, which is why coordinates are kept in float64.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to prepare for serialization.
+
+    Returns:
+        pd.DataFrame: A copy with float32 columns converted to float64, or
+                      the input unchanged if it has no float32 columns.
+    """
+    float32_cols = [col for col in df.columns if df[col].dtype == np.float32]
+    if not float32_cols:
+        return df
+    return df.assign(**{col: df[col].to_numpy().astype(str).astype(np.float64) for col in float32_cols})
+
+def dataframe_to_records(df):
+    """Converts a DataFrame into a list of JSON-ready row dictionaries.
+
+    Each column is converted to native Python objects in one pass with
+    NumPy's tolist(), and rows are then assembled by zipping the columns.
+    This avoids the per-cell boxing done by DataFrame.to_dict('records').
+    Datetime columns are rendered as ISO 8601 strings and floats are rounded
+    to JSON_DOUBLE_PRECISION decimals, matching the to_json() output.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to convert.
+
+    Returns:
+        list[dict]: One dictionary per row, keyed by column name.
+    """
+    cols = df.columns.tolist()
+    arrs = []
+    for col in cols:
+        values = df[col].to_numpy()
+        if np.issubdtype(values.dtype, np.datetime64):
+            values = np.datetime_as_string(values, unit='ms')
+        elif np.issubdtype(values.dtype, np.floating):
+            values = np.round(values, JSON_DOUBLE_PRECISION)
+        arrs.append(values.tolist())
+    return [dict(zip(cols, row)) for row in zip(*arrs)]
+
+def build_vessels_payload(vessels_df):
+    """Serializes the full vessel dataset into a JSON response body.
+
+    Args:
+        vessels_df (pd.DataFrame): The analyzed vessel data.
+
+    Returns:
+        bytes: A JSON array with one object per vessel position.
+    """
+    if vessels_df.empty:
+        return b'[]'
+
+    # Serialize straight from the column buffers rather than building a
+    # list of per-row dicts to walk again.
+    return widen_float32_columns(vessels_df).to_json(
+        orient='records', date_format='iso', double_precision=JSON_DOUBLE_PRECISION
+    ).encode('utf-8')
+
+def build_vessels_arrow_payload(vessels_df):
+    """Serializes the full vessel dataset into an Arrow IPC stream.
+
+    The columnar binary format is several times smaller than the JSON
+    payload and can be read by the browser without parsing text.
+
+    Args:
+        vessels_df (pd.DataFrame): The analyzed vessel data.
+
+    Returns:
+        bytes: An Arrow IPC stream with one row per vessel position.
+    """
+    table = pa.Table.from_pandas(vessels_df, preserve_index=False).replace_schema_metadata(None)
+
+    # Arrow JS returns 64-bit integers and nanosecond timestamps as BigInt,
+    # so cast them to types that decode to plain JavaScript numbers.
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, table[field.name].cast(pa.timestamp('ms')))
+        elif pa.types.is_int64(field.type):
+            table = table.set_column(i, field.name, table[field.name].cast(pa.float64()))
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def build_anomalies_payload(latest_anomalies_df):
+    """Serializes the latest position of each anomalous vessel into a JSON response body.
+
+    Args:
+        latest_anomalies_df (pd.DataFrame): The output of find_latest_anomalies().
+
+    Returns:
+        bytes: A JSON array with one object per anomalous vessel.
+    """
+    records = dataframe_to_records(widen_float32_columns(latest_anomalies_df))
+    return json.dumps(records, separators=(',', ':')).encode('utf-8')
+
 # ==============================================================================
 # Application Startup Sequence
 # ==============================================================================
@@ -164,14 +582,27 @@ print("--- MANTA Application Starting ---")
 
 print("1. Loading port data from source file...")
 PORT_DATA = load_port_data()
+# The ports never change, so the spatial index is built once here.
+PORT_TREE = build_port_tree(PORT_DATA)
 
 print("2. Loading vessel data from source file...")
 raw_vessel_data = load_vessel_data()
 
 print("3. Analyzing data for anomalies...")
-VESSEL_DATA = analyze_vessel_anomalies(raw_vessel_data, PORT_DATA)
-
-print("4. Application ready. Starting web server...")
+VESSEL_DATA = analyze_vessel_anomalies(raw_vessel_data, PORT_DATA, PORT_TREE)
+LATEST_ANOMALIES = find_latest_anomalies(VESSEL_DATA)
+
+# VESSEL_DATA never changes after analysis, so each API response body is
+# serialized once here instead of on every request.
+print("4. Preparing API responses...")
+VESSELS_PAYLOAD = build_vessels_payload(VESSEL_DATA)
+VESSELS_ARROW_PAYLOAD = build_vessels_arrow_payload(VESSEL_DATA)
+# Level 6 is several times faster than the default of 9 for a payload
+# that is under 1% larger.
+VESSELS_ARROW_GZIP_PAYLOAD = gzip.compress(VESSELS_ARROW_PAYLOAD, compresslevel=6)
+ANOMALIES_PAYLOAD = build_anomalies_payload(LATEST_ANOMALIES)
+
+print("5. Application ready. Starting web server...")
 print("------------------------------------")
 
 # ==============================================================================
@@ -185,27 +616,23 @@ def index():
 
 @app.route('/api/vessels')
 def get_vessels():
-    """Provides the vessel data as a JSON API endpoint."""
-    if VESSEL_DATA.empty:
-        return jsonify([])
-    
-    vessels_json = VESSEL_DATA.to_dict(orient='records')
-    return jsonify(vessels_json)
+    """Provides the vessel data as a JSON or Arrow IPC stream API endpoint.
+
+    JSON is the default; clients that ask for an Arrow stream in their
+    Accept header get the Arrow payload instead, gzip-compressed when accepted.
+    """
+    best_match = request.accept_mimetypes.best_match(['application/json', ARROW_STREAM_MIMETYPE])
+    if best_match != ARROW_STREAM_MIMETYPE:
+        response = app.response_class(VESSELS_PAYLOAD, mimetype='application/json')
+    elif request.accept_encodings['gzip'] > 0:
+        response = app.response_class(VESSELS_ARROW_GZIP_PAYLOAD, mimetype=ARROW_STREAM_MIMETYPE)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(VESSELS_ARROW_PAYLOAD, mimetype=ARROW_STREAM_MIMETYPE)
+    response.vary.update(['Accept', 'Accept-Encoding'])
+    return response
 
 @app.route('/api/anomalies')
 def get_anomalies():
     """Provides only the anomalous vessel data as a JSON API endpoint."""
-    if VESSEL_DATA.empty:
-        return jsonify([])
-
-    # Find all unique MMSIs that have at least one anomalous point. 
-    anomalous_mmsis = VESSEL_DATA[VESSEL_DATA['is_anomalous'] == True]['MMSI'].unique()
-    
-    # Filter DataFrame to get all rows for these anomalous vessels.
-    anomalous_vessels_df = VESSEL_DATA[VESSEL_DATA['MMSI'].isin(anomalous_mmsis)]
-    
-    # Get most recent data point for each unique anomalous vessel.
-    latest_anomalies = anomalous_vessels_df.loc[anomalous_vessels_df.groupby('MMSI')['BaseDateTime'].idxmax()]
-    
-    vessels_json = latest_anomalies.to_dict(orient='records')
-    return jsonify(vessels_json)
\ No newline at end of file
+    return app.response_class(ANOMALIES_PAYLOAD, mimetype='application/json')